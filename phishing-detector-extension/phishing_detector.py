@@ -5,23 +5,174 @@ Combines multiple detection techniques for maximum accuracy
 """
 
 import re
+import math
+import hashlib
 import urllib.parse
 import requests
 import sqlite3
 import json
 import pickle
 import numpy as np
+import time
+import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html.parser import HTMLParser
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from datetime import datetime
+from sklearn.feature_extraction.text import HashingVectorizer
+import joblib
 import logging
 from typing import Dict, List, Tuple, Optional
 
+try:
+    # Optional Cython fast path, built by setup.py when Cython is present
+    from phishing_ext import extract_counts_c
+except ImportError:
+    extract_counts_c = None
+
+# Result cache sizing: repeated lookups of the same URL (reloads, SPA
+# navigations) skip feature extraction and any content fetch entirely
+RESULT_CACHE_MAX_SIZE = 50_000
+RESULT_CACHE_TTL = 600  # seconds
+
+# Shared HTTP session so content fetches reuse pooled keep-alive
+# connections instead of paying a TCP + TLS handshake per URL
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Phishing signals live in the head of the page; never pull more than this
+CONTENT_FETCH_MAX_BYTES = 65536
+
+# Pool for overlapping the network-bound content fetches during batch analysis
+CONTENT_EXECUTOR = ThreadPoolExecutor(max_workers=32)
+
+# Detection methods stored as a bitmask: integer rows are smaller than the
+# old comma-joined strings and filterable with `detection_bits & ?`
+METHOD_BITS = {
+    'blacklist': 1,
+    'heuristic': 2,
+    'machine_learning': 4,
+    'content_analysis': 8,
+}
+
+# Prepared once; the background writer binds batches of rows against it
+INSERT_ANALYSIS_SQL = '''
+    INSERT INTO url_analysis (url, domain, risk_score, is_phishing, detection_bits)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        domain = excluded.domain,
+        risk_score = excluded.risk_score,
+        is_phishing = excluded.is_phishing,
+        detection_bits = excluded.detection_bits,
+        timestamp = CURRENT_TIMESTAMP
+'''
+
+# How long the writer waits to coalesce rows into one commit, and how many
+WRITE_BATCH_WINDOW = 0.05  # seconds
+WRITE_BATCH_MAX_ROWS = 256
+
+# Weights for ml_analysis, aligned with the feature vector built there;
+# swapping in a trained linear model later only means replacing this array
+ML_WEIGHTS = np.array([15, 20, 10, 15, 25, 20, 30, 25, 15, 35], dtype=np.float32)
+
+# Short-circuit URLs whose verdict is already settled (blacklist hits,
+# scores past the phishing threshold) instead of running the full pipeline
+FAST_PATH = True
+
+# Risk score at and above which a URL is classified as phishing
+PHISHING_THRESHOLD = 60
+
+class _BloomFilter:
+    """Minimal Bloom filter: a bit array probed with k double-hashed positions
+
+    Sized from the expected entry count and target false-positive rate.
+    Membership answers are "definitely not present" or "maybe present";
+    maybes must be confirmed against the source of truth.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(bits, 64)
+        self.num_hashes = max(round(self.num_bits / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.md5(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(item))
+
+
+class _ContentScanner(HTMLParser):
+    """One-pass HTML scan: forms, sensitive inputs, external resources, text"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.has_form = False
+        self.has_password_input = False
+        self.external_resources = 0
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'form':
+            self.has_form = True
+        attrs = dict(attrs)
+        if tag == 'input' and (attrs.get('type') or '').lower() == 'password':
+            self.has_password_input = True
+        for key in ('src', 'href'):
+            if (attrs.get(key) or '').startswith('http'):
+                self.external_resources += 1
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def text(self) -> str:
+        return ' '.join(self._text)
+
+
+def _char_histogram(buf: np.ndarray) -> np.ndarray:
+    """256-bucket byte histogram shared by entropy and character counts"""
+    return np.bincount(buf, minlength=256)
+
+
+def _entropy_from_counts(counts: np.ndarray, n: int) -> float:
+    """Shannon entropy from a precomputed byte histogram"""
+    if n == 0:
+        return 0.0
+    probs = counts[counts > 0] / n
+    return float(-(probs * np.log2(probs)).sum())
+
+
 class PhishingDetector:
     def __init__(self):
         self.setup_logging()
         self.setup_database()
         self.load_ml_model()
         self.load_blacklists()
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+
+        # Feature extraction and heuristics are pure functions of the URL;
+        # memoizing them means a TTL-expired result-cache entry only repays
+        # the blacklist check and any content fetch. The cached dicts are
+        # shared between hits and must be treated as read-only.
+        self.extract_url_features = lru_cache(maxsize=100_000)(self.extract_url_features)
+        self.heuristic_analysis = lru_cache(maxsize=100_000)(self.heuristic_analysis)
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -35,7 +186,16 @@ class PhishingDetector:
         """Initialize SQLite database for storing URLs and detection results"""
         self.conn = sqlite3.connect('phishing_data.db', check_same_thread=False)
         self.cursor = self.conn.cursor()
-        
+        self.db_lock = threading.Lock()
+
+        # WAL avoids the fsync-per-commit of the rollback journal and lets
+        # readers proceed while the writer thread commits batches
+        self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+        self.cursor.execute('PRAGMA cache_size=-16384')
+        self.cursor.execute('PRAGMA temp_store=MEMORY')
+        self.cursor.execute('PRAGMA mmap_size=268435456')
+
         # Create tables
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS url_analysis (
@@ -45,9 +205,23 @@ class PhishingDetector:
                 risk_score REAL,
                 is_phishing BOOLEAN,
                 detection_methods TEXT,
+                detection_bits INTEGER DEFAULT 0,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+
+        # Migrate databases created before the bitmask column existed
+        try:
+            self.cursor.execute(
+                'ALTER TABLE url_analysis ADD COLUMN detection_bits INTEGER DEFAULT 0')
+            for name, bit in METHOD_BITS.items():
+                self.cursor.execute('''
+                    UPDATE url_analysis
+                    SET detection_bits = detection_bits | ?
+                    WHERE ',' || detection_methods || ',' LIKE ?
+                ''', (bit, f'%,{name},%'))
+        except sqlite3.OperationalError:
+            pass  # column already exists
         
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS blacklist (
@@ -58,20 +232,152 @@ class PhishingDetector:
         ''')
         
         self.conn.commit()
-        
+
+        # Analyses are queued and committed in batches off the request path
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def _writer_loop(self):
+        """Background writer: coalesce queued rows into batched commits"""
+        while True:
+            row = self._write_queue.get()
+            if row is None:
+                break
+            rows = [row]
+            deadline = time.time() + WRITE_BATCH_WINDOW
+            while len(rows) < WRITE_BATCH_MAX_ROWS:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    self._flush_rows(rows)
+                    return
+                rows.append(row)
+            self._flush_rows(rows)
+
+    def _flush_rows(self, rows: List[Tuple]):
+        """Write a batch of analysis rows in a single transaction"""
+        try:
+            with self.db_lock:
+                self.cursor.executemany(INSERT_ANALYSIS_SQL, rows)
+                self.conn.commit()
+        except Exception as e:
+            self.logger.error(f"Database error: {e}")
+
     def load_ml_model(self):
         """Load pre-trained machine learning model"""
         try:
             # In production, load actual trained model
             # For demo, using a simple rule-based approach with ML-like scoring
             self.ml_model = self.create_rule_based_model()
+            self.build_matchers()
+            self.build_heuristic_scorer()
             self.logger.info("ML model loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load ML model: {e}")
             self.ml_model = None
+
+        # Vectorized batch classifier: the HashingVectorizer is stateless,
+        # the trained linear model is optional and loaded when present
+        self.hashing_vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=(3, 5),
+            n_features=2 ** 18, alternate_sign=False
+        )
+        self.batch_classifier = None
+        try:
+            self.batch_classifier = joblib.load('phishing_model.joblib')
+            self.logger.info("Batch classifier loaded successfully")
+        except FileNotFoundError:
+            self.logger.info("No trained batch classifier; using rule-based scoring")
+        except Exception as e:
+            self.logger.error(f"Failed to load batch classifier: {e}")
+
+    def build_matchers(self):
+        """Build single-pass alternation matchers from the model word lists"""
+        # One compiled alternation scans the URL once instead of one
+        # substring search (plus a fresh lower()) per keyword
+        self._keyword_re = re.compile(
+            '|'.join(re.escape(k) for k in self.ml_model['suspicious_keywords']),
+            re.IGNORECASE
+        )
+        self._sensitive_page_re = re.compile(
+            r'login|signin|password', re.IGNORECASE
+        )
+        self._suspicious_content_re = re.compile(
+            '|'.join(re.escape(p) for p in [
+                'verify your identity', 'confirm your account',
+                'update your information', 'suspended account',
+                'unauthorized access', 'security breach'
+            ])
+        )
+        # Anchored at the end of the domain so '.tk' can no longer match
+        # inside a label like 'attack.example.com'
+        susp_tlds = [t.lstrip('.') for t in self.ml_model['suspicious_tlds']]
+        self._susp_tld_set = frozenset(susp_tlds)
+        self._susp_tld_re = re.compile(
+            r'\.(?:' + '|'.join(re.escape(t) for t in susp_tlds) + r')$',
+            re.IGNORECASE
+        )
+
+    def build_heuristic_scorer(self):
+        """Generate one flat heuristic scoring function at init
+
+        The rule table is partially evaluated into a single function:
+        weights and reason strings become literals, the compiled matchers
+        are bound as plain names in the exec namespace, and reasons.append
+        is bound locally, so scoring a URL pays no per-rule attribute or
+        dict lookups.
+        """
+        rules = [
+            ('len(url) > 100', 20, 'Very long URL'),
+            ('elif len(url) < 20', 10, 'Very short URL (suspicious)'),
+            ('ip_match(domain)', 50, 'Uses IP address instead of domain'),
+            ('tld_search(domain)', 30, 'Suspicious top-level domain'),
+            ("domain.count('.') > 3", 25, 'Excessive number of subdomains'),
+            ('any(s(url) for s in pattern_searches)', 30,
+             'Suspicious pattern detected'),
+            ("sensitive_search(url) and parsed.scheme != 'https'", 40,
+             'Sensitive page without HTTPS'),
+        ]
+
+        lines = [
+            'def _score(url, parsed, domain):',
+            '    score = 0',
+            '    reasons = []',
+            '    append = reasons.append',
+        ]
+        for condition, weight, reason in rules:
+            if condition.startswith('elif '):
+                lines.append(f'    elif {condition[5:]}:')
+            else:
+                lines.append(f'    if {condition}:')
+            lines.append(f'        score += {weight}')
+            lines.append(f'        append({reason!r})')
+        lines.append("    return {'score': score, 'reasons': reasons}")
+
+        namespace = {
+            'ip_match': self.ml_model['ip_regex'].match,
+            'tld_search': self._susp_tld_re.search,
+            'pattern_searches': tuple(
+                p.search for p in self.ml_model['suspicious_patterns_compiled']),
+            'sensitive_search': self._sensitive_page_re.search,
+        }
+        exec(compile('\n'.join(lines), '<heuristic-scorer>', 'exec'), namespace)
+        self._score_heuristics = namespace['_score']
             
     def create_rule_based_model(self):
         """Create a comprehensive rule-based detection system"""
+        suspicious_patterns = [
+            r'\d+\.\d+\.\d+\.\d+',  # IP address
+            r'[-_]{2,}',                # Multiple hyphens/underscores
+            r'\.\d+\.',               # Numeric subdomain
+            r'[a-z0-9]{30,}',           # Very long random strings
+        ]
         return {
             'suspicious_keywords': [
                 'login', 'signin', 'verify', 'update', 'confirm', 'security',
@@ -85,37 +391,45 @@ class PhishingDetector:
             'legitimate_tlds': [
                 '.com', '.org', '.net', '.edu', '.gov', '.mil', '.int'
             ],
-            'suspicious_patterns': [
-                r'\d+\.\d+\.\d+\.\d+',  # IP address
-                r'[-_]{2,}',                # Multiple hyphens/underscores
-                r'\.\d+\.',               # Numeric subdomain
-                r'[a-z0-9]{30,}',           # Very long random strings
-            ]
+            'suspicious_patterns': suspicious_patterns,
+            # Compiled once here so the hot per-URL path never recompiles
+            'suspicious_patterns_compiled': [
+                re.compile(p, re.IGNORECASE) for p in suspicious_patterns
+            ],
+            'ip_regex': re.compile(r'^\d+\.\d+\.\d+\.\d+$')
         }
         
     def load_blacklists(self):
         """Load known phishing domains from various sources"""
-        self.blacklisted_domains = set()
-        
-        # Add some common phishing domains for demo
+        # The Bloom filter answers "definitely not blacklisted" in-process
+        # at ~1.5 bytes per domain; maybes are confirmed against SQLite,
+        # the source of truth, so a false positive costs one indexed SELECT
+        self._blacklist_bloom = _BloomFilter(capacity=1_000_000, error_rate=0.001)
+
+        # Seed some common phishing domains for demo
         common_phishing_domains = [
             'bit.ly', 'tinyurl.com', 't.co', 'goo.gl', 'ow.ly',
             'phishing-site.com', 'fake-login.net', 'scam-bank.org'
         ]
-        
-        for domain in common_phishing_domains:
-            self.blacklisted_domains.add(domain)
-            
-        # Load from database
-        self.cursor.execute("SELECT domain FROM blacklist")
-        for row in self.cursor.fetchall():
-            self.blacklisted_domains.add(row[0])
+
+        with self.db_lock:
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO blacklist (domain, reason)
+                VALUES (?, ?)
+            ''', [(d, 'Known phishing domain') for d in common_phishing_domains])
+            self.conn.commit()
+
+            # Load from database
+            self.cursor.execute("SELECT domain FROM blacklist")
+            for row in self.cursor.fetchall():
+                self._blacklist_bloom.add(row[0])
             
-    def extract_url_features(self, url: str) -> Dict:
+    def extract_url_features(self, url: str, parsed=None) -> Dict:
         """Extract comprehensive features from URL for analysis"""
         features = {}
-        parsed = urlparse(url)
-        
+        if parsed is None:
+            parsed = urlparse(url)
+
         # Basic URL features
         features['url_length'] = len(url)
         features['domain_length'] = len(parsed.netloc)
@@ -127,143 +441,105 @@ class PhishingDetector:
         features['subdomain_count'] = len(domain_parts) - 2 if len(domain_parts) > 2 else 0
         features['tld'] = '.' + '.'.join(domain_parts[-2:]) if len(domain_parts) >= 2 else ''
         
-        # Character distribution
-        features['dot_count'] = url.count('.')
-        features['hyphen_count'] = url.count('-')
-        features['underscore_count'] = url.count('_')
-        features['at_symbol_count'] = url.count('@')
-        features['percent_count'] = url.count('%')
-        features['slash_count'] = url.count('/')
-        features['question_count'] = url.count('?')
-        features['equal_count'] = url.count('=')
+        # Character distribution + entropy in one linear pass (C when built)
+        encoded = url.encode('utf-8', 'ignore')
+        if extract_counts_c is not None:
+            (features['dot_count'], features['hyphen_count'],
+             features['underscore_count'], features['at_symbol_count'],
+             features['percent_count'], features['slash_count'],
+             features['question_count'], features['equal_count'],
+             entropy) = extract_counts_c(encoded)
+        else:
+            buf = np.frombuffer(encoded, np.uint8)
+            counts = _char_histogram(buf)
+            features['dot_count'] = int(counts[ord('.')])
+            features['hyphen_count'] = int(counts[ord('-')])
+            features['underscore_count'] = int(counts[ord('_')])
+            features['at_symbol_count'] = int(counts[ord('@')])
+            features['percent_count'] = int(counts[ord('%')])
+            features['slash_count'] = int(counts[ord('/')])
+            features['question_count'] = int(counts[ord('?')])
+            features['equal_count'] = int(counts[ord('=')])
+            entropy = _entropy_from_counts(counts, buf.size)
         
         # Security indicators
         features['has_https'] = 1 if parsed.scheme == 'https' else 0
         features['has_http'] = 1 if parsed.scheme == 'http' else 0
         features['has_www'] = 1 if 'www.' in parsed.netloc else 0
-        features['has_ip'] = 1 if re.match(r'^\d+\.\d+\.\d+\.\d+$', parsed.netloc) else 0
+        features['has_ip'] = 1 if self.ml_model['ip_regex'].match(parsed.netloc) else 0
         
         # Suspicious patterns
-        features['has_suspicious_keywords'] = 0
-        for keyword in self.ml_model['suspicious_keywords']:
-            if keyword.lower() in url.lower():
-                features['has_suspicious_keywords'] = 1
-                break
-                
-        # Entropy calculation (randomness measure)
-        features['entropy'] = self.calculate_entropy(url)
+        features['has_suspicious_keywords'] = 1 if self._keyword_re.search(url) else 0
+
+        # Entropy calculation (randomness measure) from the same pass
+        features['entropy'] = entropy
         
         return features
         
     def calculate_entropy(self, string: str) -> float:
         """Calculate Shannon entropy of a string"""
-        import math
-        prob = [float(string.count(c)) / len(string) for c in dict.fromkeys(list(string))]
-        entropy = -sum([p * math.log(p) / math.log(2.0) for p in prob])
-        return entropy
-        
-    def check_blacklist(self, url: str) -> bool:
+        buf = np.frombuffer(string.encode('utf-8', 'ignore'), np.uint8)
+        return _entropy_from_counts(_char_histogram(buf), buf.size)
+        
+    def _blacklist_hit(self, domain: str) -> bool:
+        """Bloom pre-filter, then confirm maybes against the database"""
+        if domain not in self._blacklist_bloom:
+            return False
+        with self.db_lock:
+            self.cursor.execute(
+                'SELECT 1 FROM blacklist WHERE domain = ?', (domain,))
+            return self.cursor.fetchone() is not None
+
+    def check_blacklist(self, url: str, parsed=None, domain=None) -> bool:
         """Check if URL or domain is in blacklist"""
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
+        if domain is None:
+            if parsed is None:
+                parsed = urlparse(url)
+            domain = parsed.netloc.lower()
+
         # Check exact domain
-        if domain in self.blacklisted_domains:
+        if self._blacklist_hit(domain):
             return True
-            
-        # Check subdomains
-        domain_parts = domain.split('.')
-        for i in range(len(domain_parts)):
-            subdomain = '.'.join(domain_parts[i:])
-            if subdomain in self.blacklisted_domains:
+
+        # Walk parent suffixes label by label; each step is a slice plus a
+        # Bloom probe, with no split/join list allocations
+        i = 0
+        while True:
+            j = domain.find('.', i)
+            if j < 0:
+                return False
+            i = j + 1
+            if self._blacklist_hit(domain[i:]):
                 return True
-                
-        return False
         
-    def heuristic_analysis(self, url: str) -> Dict:
+    def heuristic_analysis(self, url: str, parsed=None, domain=None) -> Dict:
         """Perform heuristic analysis on URL"""
-        score = 0
-        reasons = []
+        if parsed is None:
+            parsed = urlparse(url)
+        if domain is None:
+            domain = parsed.netloc.lower()
+        return self._score_heuristics(url, parsed, domain)
         
-        # URL length analysis
-        if len(url) > 100:
-            score += 20
-            reasons.append("Very long URL")
-        elif len(url) < 20:
-            score += 10
-            reasons.append("Very short URL (suspicious)")
-            
-        # Domain analysis
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        # Check for IP address
-        if re.match(r'^\d+\.\d+\.\d+\.\d+$', domain):
-            score += 50
-            reasons.append("Uses IP address instead of domain")
-            
-        # Check for suspicious TLD
-        if any(tld in domain for tld in self.ml_model['suspicious_tlds']):
-            score += 30
-            reasons.append("Suspicious top-level domain")
-            
-        # Check for excessive subdomains
-        if domain.count('.') > 3:
-            score += 25
-            reasons.append("Excessive number of subdomains")
-            
-        # Check for suspicious patterns
-        for pattern in self.ml_model['suspicious_patterns']:
-            if re.search(pattern, url, re.IGNORECASE):
-                score += 30
-                reasons.append("Suspicious pattern detected")
-                break
-                
-        # Check for HTTPS on sensitive pages
-        if any(keyword in url.lower() for keyword in ['login', 'signin', 'password']):
-            if not parsed.scheme == 'https':
-                score += 40
-                reasons.append("Sensitive page without HTTPS")
-                
-        return {'score': score, 'reasons': reasons}
-        
-    def ml_analysis(self, url: str) -> Dict:
+    def ml_analysis(self, url: str, parsed=None) -> Dict:
         """Perform machine learning-based analysis"""
-        features = self.extract_url_features(url)
-        
-        # Calculate risk score based on features
-        risk_score = 0
-        
-        # Length-based scoring
-        if features['url_length'] > 75:
-            risk_score += 15
-        if features['domain_length'] > 50:
-            risk_score += 20
-            
-        # Character-based scoring
-        if features['dot_count'] > 5:
-            risk_score += 10
-        if features['hyphen_count'] > 3:
-            risk_score += 15
-        if features['at_symbol_count'] > 0:
-            risk_score += 25
-            
-        # Security scoring
-        if not features['has_https']:
-            risk_score += 20
-        if features['has_suspicious_keywords']:
-            risk_score += 30
-            
-        # Entropy scoring
-        if features['entropy'] > 4.5:
-            risk_score += 25
-            
-        # Domain-based scoring
-        if features['subdomain_count'] > 2:
-            risk_score += 15
-        if features['tld'] in self.ml_model['suspicious_tlds']:
-            risk_score += 35
-            
+        features = self.extract_url_features(url, parsed)
+
+        # Branchless scoring: the threshold comparisons form a 0/1 vector
+        # and the whole rule set collapses to one dot product
+        feature_vec = np.array([
+            features['url_length'] > 75,
+            features['domain_length'] > 50,
+            features['dot_count'] > 5,
+            features['hyphen_count'] > 3,
+            features['at_symbol_count'] > 0,
+            not features['has_https'],
+            bool(features['has_suspicious_keywords']),
+            features['entropy'] > 4.5,
+            features['subdomain_count'] > 2,
+            features['tld'].rpartition('.')[2] in self._susp_tld_set,
+        ], dtype=np.float32)
+        risk_score = float(feature_vec @ ML_WEIGHTS)
+
         return {
             'risk_score': risk_score,
             'features': features,
@@ -273,48 +549,82 @@ class PhishingDetector:
     def content_analysis(self, url: str) -> Dict:
         """Analyze webpage content for phishing indicators"""
         try:
-            response = requests.get(url, timeout=5, allow_redirects=False)
-            content = response.text.lower()
-            
+            with SESSION.get(url, timeout=5, allow_redirects=False,
+                             stream=True) as response:
+                # Only HTML bodies carry the signals scored below
+                content_type = response.headers.get('Content-Type', 'text/html')
+                if not content_type.startswith('text/html'):
+                    return {'score': 0, 'reasons': []}
+                raw = response.raw.read(CONTENT_FETCH_MAX_BYTES, decode_content=True)
+            content = raw.decode(response.encoding or 'utf-8', 'ignore').lower()
+
+            # Walk the markup once instead of repeated substring scans
+            scanner = _ContentScanner()
+            scanner.feed(content)
+            text = scanner.text()
+
             score = 0
             reasons = []
-            
-            # Check for forms
-            if '<form' in content:
-                if any(field in content for field in ['password', 'credit card', 'ssn', 'social security']):
+
+            # Check for forms with sensitive fields
+            if scanner.has_form:
+                if scanner.has_password_input or any(
+                        field in text for field in ['password', 'credit card', 'ssn', 'social security']):
                     score += 40
                     reasons.append("Sensitive form fields detected")
-                    
-            # Check for suspicious content
-            suspicious_content = [
-                'verify your identity', 'confirm your account', 'update your information',
-                'suspended account', 'unauthorized access', 'security breach'
-            ]
-            
-            for phrase in suspicious_content:
-                if phrase in content:
-                    score += 25
-                    reasons.append(f"Suspicious content: {phrase}")
-                    
+
+            # Check for suspicious content (one regex sweep over the page text)
+            for phrase in sorted(set(self._suspicious_content_re.findall(text))):
+                score += 25
+                reasons.append(f"Suspicious content: {phrase}")
+                if score >= PHISHING_THRESHOLD:
+                    # Strong enough on its own to flag the page; stop scoring
+                    return {'score': score, 'reasons': reasons}
+
             # Check for external resources
-            external_links = content.count('src="http') + content.count('href="http')
-            if external_links > 10:
+            if scanner.external_resources > 10:
                 score += 20
                 reasons.append("Excessive external resources")
-                
+
             return {'score': score, 'reasons': reasons}
             
         except Exception as e:
             self.logger.error(f"Content analysis failed: {e}")
             return {'score': 0, 'reasons': []}
             
-    def analyze_url(self, url: str) -> Dict:
-        """Comprehensive URL analysis using multiple techniques"""
+    def _get_cached_result(self, url: str) -> Optional[Dict]:
+        """Return a recent cached analysis for this URL, if any"""
+        with self._result_cache_lock:
+            entry = self._result_cache.get(url)
+            if entry is None:
+                return None
+            expires, results = entry
+            if expires < time.time():
+                del self._result_cache[url]
+                return None
+            self._result_cache.move_to_end(url)
+            return dict(results)
+
+    def _cache_result(self, url: str, results: Dict):
+        """Store an analysis result with TTL and LRU eviction"""
+        with self._result_cache_lock:
+            self._result_cache[url] = (time.time() + RESULT_CACHE_TTL, dict(results))
+            self._result_cache.move_to_end(url)
+            while len(self._result_cache) > RESULT_CACHE_MAX_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def _static_analysis(self, url: str) -> Dict:
+        """Run the CPU-only stages: blacklist, heuristics, and ML scoring"""
         self.logger.info(f"Analyzing URL: {url}")
-        
+
+        # Parse and lowercase once; every stage below reuses the results
+        parsed = urlparse(url)
+        domain = parsed.netloc.lower()
+
         # Initialize results
         results = {
             'url': url,
+            'domain': parsed.netloc,
             'timestamp': datetime.now().isoformat(),
             'is_phishing': False,
             'risk_score': 0,
@@ -324,39 +634,42 @@ class PhishingDetector:
         }
         
         # Check blacklist first
-        if self.check_blacklist(url):
+        if self.check_blacklist(url, parsed, domain):
             results['is_phishing'] = True
             results['risk_score'] += 80
             results['detection_methods'].append('blacklist')
             results['reasons'].append("URL found in phishing blacklist")
-            
+            if FAST_PATH:
+                # Known-bad domain: the verdict is settled, skip the rest
+                results['confidence'] = 100
+                return results
+
         # Heuristic analysis
-        heuristic = self.heuristic_analysis(url)
+        heuristic = self.heuristic_analysis(url, parsed, domain)
         results['risk_score'] += heuristic['score']
         if heuristic['score'] > 0:
             results['detection_methods'].append('heuristic')
             results['reasons'].extend(heuristic['reasons'])
             
         # Machine learning analysis
-        ml_result = self.ml_analysis(url)
+        ml_result = self.ml_analysis(url, parsed)
         results['risk_score'] += ml_result['risk_score']
         results['confidence'] = max(results['confidence'], ml_result['confidence'])
         if ml_result['risk_score'] > 0:
             results['detection_methods'].append('machine_learning')
-            
-        # Content analysis (if URL seems suspicious)
-        if results['risk_score'] > 30:
-            try:
-                content_result = self.content_analysis(url)
-                results['risk_score'] += content_result['score']
-                if content_result['score'] > 0:
-                    results['detection_methods'].append('content_analysis')
-                    results['reasons'].extend(content_result['reasons'])
-            except Exception as e:
-                self.logger.error(f"Content analysis error: {e}")
-                
+
+        return results
+
+    def _finalize_analysis(self, results: Dict, content_result: Optional[Dict]) -> Dict:
+        """Fold in content analysis, classify, and persist the result"""
+        if content_result is not None:
+            results['risk_score'] += content_result['score']
+            if content_result['score'] > 0:
+                results['detection_methods'].append('content_analysis')
+                results['reasons'].extend(content_result['reasons'])
+
         # Final classification
-        if results['risk_score'] >= 60:
+        if results['risk_score'] >= PHISHING_THRESHOLD:
             results['is_phishing'] = True
         elif results['risk_score'] >= 40:
             results['is_phishing'] = None  # Suspicious
@@ -365,36 +678,122 @@ class PhishingDetector:
             
         # Store results in database
         self.store_analysis(results)
-        
+        self._cache_result(results['url'], results)
+
+        return results
+
+    def _needs_content_analysis(self, results: Dict) -> bool:
+        """Content fetch only pays off when it could change the verdict"""
+        if results['risk_score'] <= 30:
+            return False
+        if FAST_PATH and results['risk_score'] >= PHISHING_THRESHOLD:
+            # Already past the phishing threshold; the fetch cannot change it
+            return False
+        return True
+
+    def analyze_url(self, url: str) -> Dict:
+        """Comprehensive URL analysis using multiple techniques"""
+        cached = self._get_cached_result(url)
+        if cached is not None:
+            return cached
+
+        results = self._static_analysis(url)
+
+        # Content analysis (if URL seems suspicious)
+        content_result = None
+        if self._needs_content_analysis(results):
+            try:
+                content_result = self.content_analysis(url)
+            except Exception as e:
+                self.logger.error(f"Content analysis error: {e}")
+
+        return self._finalize_analysis(results, content_result)
+
+    def analyze_urls(self, urls: List[str]) -> List[Dict]:
+        """Analyze a batch of URLs, overlapping the content fetches
+
+        The CPU-only stages run sequentially per URL; the network-bound
+        content fetches for suspicious URLs are dispatched to a shared
+        thread pool so the batch waits on them together, not one by one.
+        """
+        outputs: List[Optional[Dict]] = [None] * len(urls)
+        partials = {}
+        fetches = {}
+
+        # One sparse matmul scores the whole batch; decisive probabilities
+        # skip the per-URL rule-based pipeline entirely
+        probs = None
+        if self.batch_classifier is not None and urls:
+            try:
+                X = self.hashing_vectorizer.transform(urls)
+                probs = self.batch_classifier.predict_proba(X)[:, 1]
+            except Exception as e:
+                self.logger.error(f"Batch classification failed: {e}")
+
+        for i, url in enumerate(urls):
+            cached = self._get_cached_result(url)
+            if cached is not None:
+                outputs[i] = cached
+                continue
+            if probs is not None and (probs[i] > 0.9 or probs[i] < 0.05):
+                outputs[i] = self._classifier_verdict(url, float(probs[i]))
+                continue
+            partial = self._static_analysis(url)
+            partials[i] = partial
+            if self._needs_content_analysis(partial):
+                fetches[i] = CONTENT_EXECUTOR.submit(self.content_analysis, url)
+
+        for i, partial in partials.items():
+            content_result = None
+            future = fetches.get(i)
+            if future is not None:
+                try:
+                    content_result = future.result()
+                except Exception as e:
+                    self.logger.error(f"Content analysis error: {e}")
+            outputs[i] = self._finalize_analysis(partial, content_result)
+
+        return outputs
+
+    def _classifier_verdict(self, url: str, prob: float) -> Dict:
+        """Build a result directly from a decisive classifier probability"""
+        results = {
+            'url': url,
+            'domain': urlparse(url).netloc,
+            'timestamp': datetime.now().isoformat(),
+            'is_phishing': prob > 0.9,
+            'risk_score': round(prob * 100, 2),
+            'confidence': round(max(prob, 1 - prob) * 100, 2),
+            'detection_methods': ['machine_learning'],
+            'reasons': []
+        }
+        self.store_analysis(results)
+        self._cache_result(url, results)
         return results
         
     def store_analysis(self, results: Dict):
-        """Store analysis results in database"""
-        try:
-            self.cursor.execute('''
-                INSERT OR REPLACE INTO url_analysis 
-                (url, domain, risk_score, is_phishing, detection_methods)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                results['url'],
-                urlparse(results['url']).netloc,
-                results['risk_score'],
-                results['is_phishing'],
-                ','.join(results['detection_methods'])
-            ))
-            self.conn.commit()
-        except Exception as e:
-            self.logger.error(f"Database error: {e}")
+        """Queue analysis results for the background batch writer"""
+        bits = 0
+        for method in results['detection_methods']:
+            bits |= METHOD_BITS.get(method, 0)
+        self._write_queue.put((
+            results['url'],
+            results.get('domain') or urlparse(results['url']).netloc,
+            results['risk_score'],
+            results['is_phishing'],
+            bits
+        ))
             
     def add_to_blacklist(self, domain: str, reason: str = "User reported"):
         """Add domain to blacklist"""
         try:
-            self.cursor.execute('''
-                INSERT OR IGNORE INTO blacklist (domain, reason)
-                VALUES (?, ?)
-            ''', (domain, reason))
-            self.conn.commit()
-            self.blacklisted_domains.add(domain)
+            with self.db_lock:
+                self.cursor.execute('''
+                    INSERT OR IGNORE INTO blacklist (domain, reason)
+                    VALUES (?, ?)
+                ''', (domain, reason))
+                self.conn.commit()
+            self._blacklist_bloom.add(domain)
             self.logger.info(f"Added {domain} to blacklist")
         except Exception as e:
             self.logger.error(f"Blacklist update error: {e}")
@@ -402,26 +801,39 @@ class PhishingDetector:
     def get_statistics(self) -> Dict:
         """Get detection statistics"""
         try:
-            self.cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_analyzed,
-                    SUM(CASE WHEN is_phishing = 1 THEN 1 ELSE 0 END) as phishing_detected,
-                    AVG(risk_score) as avg_risk_score
-                FROM url_analysis
-            ''')
-            result = self.cursor.fetchone()
-            
+            with self.db_lock:
+                self.cursor.execute('''
+                    SELECT
+                        COUNT(*) as total_analyzed,
+                        SUM(CASE WHEN is_phishing = 1 THEN 1 ELSE 0 END) as phishing_detected,
+                        AVG(risk_score) as avg_risk_score,
+                        SUM(CASE WHEN detection_bits & 1 THEN 1 ELSE 0 END) as blacklist_hits,
+                        SUM(CASE WHEN detection_bits & 2 THEN 1 ELSE 0 END) as heuristic_hits,
+                        SUM(CASE WHEN detection_bits & 4 THEN 1 ELSE 0 END) as ml_hits,
+                        SUM(CASE WHEN detection_bits & 8 THEN 1 ELSE 0 END) as content_hits
+                    FROM url_analysis
+                ''')
+                result = self.cursor.fetchone()
+
             return {
                 'total_analyzed': result[0] or 0,
                 'phishing_detected': result[1] or 0,
-                'avg_risk_score': round(result[2] or 0, 2)
+                'avg_risk_score': round(result[2] or 0, 2),
+                'blacklist_hits': result[3] or 0,
+                'heuristic_hits': result[4] or 0,
+                'ml_hits': result[5] or 0,
+                'content_hits': result[6] or 0
             }
         except Exception as e:
             self.logger.error(f"Statistics error: {e}")
-            return {'total_analyzed': 0, 'phishing_detected': 0, 'avg_risk_score': 0}
+            return {'total_analyzed': 0, 'phishing_detected': 0, 'avg_risk_score': 0,
+                    'blacklist_hits': 0, 'heuristic_hits': 0, 'ml_hits': 0,
+                    'content_hits': 0}
             
     def close(self):
-        """Close database connection"""
+        """Flush pending writes and close database connection"""
+        self._write_queue.put(None)
+        self._writer.join(timeout=5)
         self.conn.close()
 
 
@@ -432,7 +844,19 @@ from flask_cors import CORS
 app = Flask(__name__)
 CORS(app)
 
-detector = PhishingDetector()
+# Lazy per-process singleton: each WSGI worker builds its own detector
+# (database connection, compiled matchers) on first request
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_detector() -> PhishingDetector:
+    """Return the per-process PhishingDetector, creating it on first use"""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = PhishingDetector()
+    return _detector
 
 @app.route('/analyze', methods=['POST'])
 def analyze_url():
@@ -440,16 +864,32 @@ def analyze_url():
     try:
         data = request.get_json()
         url = data.get('url', '')
-        
+
         if not url:
             return jsonify({'error': 'URL is required'}), 400
-            
-        results = detector.analyze_url(url)
+
+        results = get_detector().analyze_url(url)
         return jsonify(results)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """API endpoint for batch URL analysis"""
+    try:
+        data = request.get_json()
+        urls = data.get('urls', [])
+
+        if not urls:
+            return jsonify({'error': 'urls is required'}), 400
+
+        results = get_detector().analyze_urls(urls)
+        return jsonify(results)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/blacklist', methods=['POST'])
 def add_blacklist():
     """API endpoint to add domain to blacklist"""
@@ -461,7 +901,7 @@ def add_blacklist():
         if not domain:
             return jsonify({'error': 'Domain is required'}), 400
             
-        detector.add_to_blacklist(domain, reason)
+        get_detector().add_to_blacklist(domain, reason)
         return jsonify({'success': True, 'message': f'{domain} added to blacklist'})
         
     except Exception as e:
@@ -471,7 +911,7 @@ def add_blacklist():
 def get_statistics():
     """API endpoint for detection statistics"""
     try:
-        stats = detector.get_statistics()
+        stats = get_detector().get_statistics()
         return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -482,4 +922,5 @@ def health_check():
     return jsonify({'status': 'healthy', 'service': 'phishing-detector'})
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Development only; in production serve through wsgi.py with gunicorn
+    app.run(port=5000)
\ No newline at end of file
@@ -6,6 +6,14 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+# Optional C fast path for per-URL character statistics; the pure-Python
+# backend works without it, so a missing Cython is not an error
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(["phishing_ext.pyx"])
+except ImportError:
+    ext_modules = []
+
 setup(
     name="phishing-detector-extension",
     version="1.0.0",
@@ -30,6 +38,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "phishing-detector=phishing_detector:main",
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the phishing detection API
+
+Serve with a production WSGI server instead of the Flask dev server:
+
+    gunicorn -w $(nproc) --threads 8 --worker-class gthread wsgi:application
+
+Each worker builds its own detector (database connection, compiled
+matchers) lazily on first request; WAL mode keeps the shared SQLite
+database safe across concurrent workers.
+"""
+
+from phishing_detector import app
+
+application = app